@@ -7,13 +7,19 @@ from app.agent.toolcall import ToolCallAgent
 from app.config import config
 from app.logger import logger
 from app.prompt.manus import NEXT_STEP_PROMPT, SYSTEM_PROMPT
-from app.tool import Terminate, ToolCollection
+from app.tool import Terminate, ToolCollection, message_tools
 from app.tool.ask_human import AskHuman
 from app.tool.browser_use_tool import BrowserUseTool
 from app.tool.mcp import MCPClients, MCPClientTool
+from app.tool.message_tools import (
+    ConsoleMessageTool,
+    DiscordWebhookTool,
+    FileMessageTool,
+    SlackWebhookTool,
+    TelegramBotTool,
+)
 from app.tool.python_execute import PythonExecute
 from app.tool.str_replace_editor import StrReplaceEditor
-from app.tool.message_tools import DiscordWebhookTool, SlackWebhookTool, TelegramBotTool, ConsoleMessageTool, FileMessageTool
 
 
 class Manus(ToolCallAgent):
@@ -142,6 +148,9 @@ class Manus(ToolCallAgent):
         if self._initialized:
             await self.disconnect_mcp_server()
             self._initialized = False
+        # Finish pending message writes; the webhook client and its retry
+        # queue outlive a single run and are closed at process shutdown.
+        await message_tools.flush_all()
 
     async def think(self) -> bool:
         """Process current state and decide next actions with appropriate context."""
@@ -1,8 +1,442 @@
-import requests
-import json
-from typing import Optional, List
-from app.tool import BaseTool
+import asyncio
+import atexit
+import functools
+import importlib.util
+import os
+import random
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import fastjsonschema
+import httpx
+import orjson
+
 from app.logger import logger
+from app.tool.base import BaseTool
+
+
+# Keep enough idle connections around that bursts of webhooks to the same
+# hosts reuse their TCP+TLS sessions instead of handshaking again.
+_POOL_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Platform limits used when several messages are sent in one request.
+_DISCORD_MAX_CONTENT = 2000
+_SLACK_MAX_SECTION = 3000
+_SLACK_MAX_BLOCKS = 50
+
+# Rate limiting and transient server errors are worth retrying; any other
+# status is returned to the caller as-is. Malformed requests and missing,
+# revoked or unauthorized webhooks never recover on their own, so a queued
+# message that ends with one of those gets no further retries and is
+# dead-lettered as unrecoverable, to be replayed once the webhook is fixed.
+_RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+_NON_RETRYABLE_STATUSES = {400, 401, 403, 404}
+
+# Sends that fail in a retryable way are queued for a fixed pool of background
+# workers so the caller doesn't wait out the backoff. A message still failing
+# after _RETRY_ATTEMPTS more attempts, left queued at shutdown, or arriving
+# while the queue is full is written to _DEAD_LETTER_FILE.
+_RETRY_ATTEMPTS = 3
+_RETRY_WORKERS = 4
+_RETRY_QUEUE_SIZE = 1000
+_DEAD_LETTER_FILE = "webhook_failures.jsonl"
+
+# How long close() lets queued retries finish before dead-lettering the rest.
+_SHUTDOWN_GRACE = 10.0
+
+# Cap in-flight requests per host so parallel tool calls stay under the
+# platforms' rate limits instead of burning retries on 429s.
+_DEFAULT_HOST_CONCURRENCY = 5
+_HOST_CONCURRENCY = {
+    "discord.com": 5,
+    "hooks.slack.com": 5,
+    "api.telegram.org": 20,
+}
+
+
+def _new_client() -> httpx.AsyncClient:
+    """
+    Create the client shared by the webhook tools. With HTTP/2 (needs the
+    ``h2`` package from ``httpx[http2]``) concurrent requests to one host are
+    multiplexed over a single connection.
+    """
+    return httpx.AsyncClient(timeout=10.0, limits=_POOL_LIMITS, http2=_HTTP2)
+
+
+class _LoopResources:
+    """
+    Asyncio objects shared by the message tools within one event loop.
+
+    Locks, semaphores and pooled connections are bound to the loop that first
+    uses them, so each running loop gets its own set, created on demand.
+    """
+
+    def __init__(self) -> None:
+        self.client = _new_client()
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # One lock per file, dropped once nothing holds or waits on it.
+        self.write_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        # filename -> (lines, future) for appends waiting on the write lock.
+        self.pending_appends: Dict[str, Tuple[List[str], asyncio.Future]] = {}
+        self.retry_queue: asyncio.Queue = asyncio.Queue(maxsize=_RETRY_QUEUE_SIZE)
+        self.retry_workers: Set[asyncio.Task] = set()
+
+    def write_lock(self, filename: str) -> asyncio.Lock:
+        """Return the lock serializing writes to ``filename``."""
+        lock = self.write_locks.get(filename)
+        if lock is None:
+            lock = self.write_locks[filename] = asyncio.Lock()
+        return lock
+
+    def host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Return the concurrency limiter for ``host``."""
+        semaphore = self.host_semaphores.get(host)
+        if semaphore is None:
+            limit = _HOST_CONCURRENCY.get(host, _DEFAULT_HOST_CONCURRENCY)
+            semaphore = self.host_semaphores[host] = asyncio.Semaphore(limit)
+        return semaphore
+
+
+_LOOP_RESOURCES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _resources() -> _LoopResources:
+    """Return the message tool resources for the running event loop."""
+    loop = asyncio.get_running_loop()
+    resources = _LOOP_RESOURCES.get(loop)
+    if resources is None:
+        resources = _LOOP_RESOURCES[loop] = _LoopResources()
+    return resources
+
+
+async def close(grace: float = _SHUTDOWN_GRACE) -> None:
+    """
+    Release the webhook tools' resources in the running loop. Call once at
+    process shutdown, not after each agent run.
+
+    Queued retries get up to ``grace`` seconds to finish; messages still
+    waiting after that are written to the dead-letter file.
+    """
+    resources = _LOOP_RESOURCES.pop(asyncio.get_running_loop(), None)
+    if resources is None:
+        return
+    if resources.retry_workers and grace > 0:
+        try:
+            await asyncio.wait_for(resources.retry_queue.join(), grace)
+        except asyncio.TimeoutError:
+            logger.warning("Webhook retries still pending at shutdown")
+    for worker in resources.retry_workers:
+        worker.cancel()
+    await asyncio.gather(*resources.retry_workers, return_exceptions=True)
+    # Workers cancelled before their first run never reach their own cleanup.
+    queue = resources.retry_queue
+    while not queue.empty():
+        url, payloads, _ = queue.get_nowait()
+        _write_dead_letter(url, payloads, "shut down before the retry completed")
+    await resources.client.aclose()
+
+
+class _NotDelivered(Exception):
+    """A webhook send failed transiently and was handed to the retry queue."""
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_url(url: str) -> httpx.URL:
+    """Parse a webhook URL once; agents tend to reuse the same few URLs."""
+    return httpx.URL(url)
+
+
+@functools.lru_cache(maxsize=128)
+def _tg_url(token: str) -> str:
+    """Return the Telegram ``sendMessage`` endpoint for a bot token."""
+    return f"https://api.telegram.org/bot{token}/sendMessage"
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Return the delay requested by a ``Retry-After`` header, if any."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def _backoff_delay(
+    attempt: int,
+    response: Optional[httpx.Response] = None,
+    base: float = 1.0,
+    cap: float = 30.0,
+) -> float:
+    """
+    Seconds to wait before retry number ``attempt + 1``: the server's
+    ``Retry-After`` for a 429, otherwise full-jitter exponential backoff.
+    """
+    if response is not None and response.status_code == 429:
+        delay = _retry_after(response)
+        if delay is not None:
+            return min(cap, delay)
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+async def _post_with_backoff(
+    client: httpx.AsyncClient,
+    url: str,
+    json: dict,
+    max_retries: int = 3,
+    base: float = 1.0,
+    cap: float = 30.0,
+) -> httpx.Response:
+    """
+    POST ``json`` to ``url``, retrying transient failures with full-jitter
+    exponential backoff.
+
+    Transport errors and 429/5xx responses are retried up to ``max_retries``
+    times. A 429 honours the server's ``Retry-After`` header when present.
+    Other statuses are returned immediately, and a URL httpx cannot send to
+    raises without retrying.
+    The last response is returned, or the last transport error re-raised,
+    once retries are exhausted. The payload is serialized once with orjson
+    and reused across attempts. Each attempt holds the host's concurrency
+    slot only while the request is in flight, not while backing off.
+    """
+    parsed_url = _parse_url(url)
+    semaphore = _resources().host_semaphore(parsed_url.host)
+    content = orjson.dumps(json)
+    for attempt in range(max_retries + 1):
+        try:
+            async with semaphore:
+                response = await client.post(
+                    parsed_url, content=content, headers=_JSON_HEADERS
+                )
+        except httpx.UnsupportedProtocol:
+            # A malformed webhook URL will not start working on retry.
+            raise
+        except httpx.TransportError as e:
+            if attempt == max_retries:
+                raise
+            delay = _backoff_delay(attempt, base=base, cap=cap)
+            logger.warning(f"Webhook request failed ({e}), retrying in {delay:.2f}s")
+        else:
+            if (
+                response.status_code not in _RETRYABLE_STATUSES
+                or attempt == max_retries
+            ):
+                return response
+            delay = _backoff_delay(attempt, response, base=base, cap=cap)
+            logger.warning(
+                f"Webhook returned status {response.status_code}, retrying in {delay:.2f}s"
+            )
+        await asyncio.sleep(delay)
+
+
+async def _post_or_queue(
+    url: str, payload: dict, then: Sequence[dict] = ()
+) -> httpx.Response:
+    """
+    POST ``payload`` to ``url`` once without blocking on backoff.
+
+    If the attempt fails in a retryable way, the payload is queued for the
+    background retry workers, followed in order by the ``then`` payloads that
+    were to be sent after it, and ``_NotDelivered`` is raised; otherwise the
+    response is returned for the caller to interpret.
+    """
+    try:
+        response = await _post_with_backoff(
+            _resources().client, url, json=payload, max_retries=0
+        )
+    except httpx.UnsupportedProtocol:
+        raise
+    except httpx.TransportError as e:
+        reason, delay = str(e) or type(e).__name__, _backoff_delay(0)
+    else:
+        if response.status_code not in _RETRYABLE_STATUSES:
+            return response
+        reason = f"status {response.status_code}"
+        delay = _backoff_delay(0, response)
+
+    payloads = [payload, *then]
+    subject = "it was" if not then else f"it and the {len(then)} parts after it were"
+    resources = _resources()
+    try:
+        due = asyncio.get_running_loop().time() + delay
+        resources.retry_queue.put_nowait((url, payloads, due))
+    except asyncio.QueueFull:
+        await asyncio.to_thread(_write_dead_letter, url, payloads, reason)
+        raise _NotDelivered(
+            f"{reason}; the retry queue is full, so {subject} saved to {_DEAD_LETTER_FILE}"
+        )
+    _start_retry_workers(resources)
+    raise _NotDelivered(
+        f"{reason}; {subject} queued for a background retry, do not send again"
+    )
+
+
+def _start_retry_workers(resources: _LoopResources) -> None:
+    resources.retry_workers = {w for w in resources.retry_workers if not w.done()}
+    while len(resources.retry_workers) < _RETRY_WORKERS:
+        resources.retry_workers.add(
+            asyncio.create_task(_retry_worker(resources.retry_queue))
+        )
+
+
+async def _retry_worker(queue: asyncio.Queue) -> None:
+    """Retry queued messages once they are due, dead-lettering final failures."""
+    loop = asyncio.get_running_loop()
+    item = None
+    try:
+        while True:
+            item = await queue.get()
+            url, payloads, due = item
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            # Parts of one send go out in order; a failure stops the rest.
+            error = None
+            while payloads and error is None:
+                error = await _retry(url, payloads[0])
+                if error is None:
+                    payloads.pop(0)
+            item = None
+            if payloads:
+                await asyncio.to_thread(_write_dead_letter, url, payloads, error)
+            queue.task_done()
+    except asyncio.CancelledError:
+        # The loop is shutting down; keep what was never delivered.
+        pending = [item] if item is not None else []
+        while not queue.empty():
+            pending.append(queue.get_nowait())
+        for url, payloads, _ in pending:
+            _write_dead_letter(url, payloads, "shut down before the retry completed")
+        raise
+
+
+async def _retry(url: str, payload: dict) -> Optional[str]:
+    """Retry a queued message, returning why it should be dead-lettered, if so."""
+    host = _parse_url(url).host
+    try:
+        response = await _post_with_backoff(
+            _resources().client, url, json=payload, max_retries=_RETRY_ATTEMPTS - 1
+        )
+    except httpx.HTTPError as e:
+        error = str(e) or type(e).__name__
+    else:
+        if response.is_success:
+            logger.info(f"Queued webhook message to {host} delivered")
+            return None
+        error = f"status {response.status_code}"
+        if response.status_code in _NON_RETRYABLE_STATUSES:
+            error += " (unrecoverable)"
+
+    logger.error(f"Giving up on webhook message to {host}: {error}")
+    return error
+
+
+def _write_dead_letter(url: str, payloads: List[dict], error: str) -> None:
+    """
+    Record undeliverable webhook messages, one line each, so they can be
+    replayed later.
+
+    Webhook URLs (and Telegram URLs, which embed the bot token) are secrets,
+    so the file is only readable by its owner.
+    """
+    ts = time.time()
+    data = b"".join(
+        orjson.dumps({"url": url, "payload": payload, "error": error, "ts": ts}) + b"\n"
+        for payload in payloads
+    )
+    try:
+        _append_bytes(_DEAD_LETTER_FILE, data, private=True)
+    except OSError as e:
+        logger.error(f"Error writing to {_DEAD_LETTER_FILE}: {e}")
+
+
+def webhook_errors(name: str):
+    """
+    Turn HTTP failures raised by a webhook coroutine into an error result.
+
+    Only request errors are handled here; anything else is a bug and is left
+    to propagate to the caller.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs) -> str:
+            try:
+                return await fn(*args, **kwargs)
+            except _NotDelivered as e:
+                error_msg = f"{name} message not delivered: {e}"
+                logger.warning(error_msg)
+                return f"Error: {error_msg}"
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                error_msg = f"Error sending {name} message: {e}"
+                logger.error(error_msg)
+                return f"Error: {error_msg}"
+
+        return wrapper
+
+    return decorator
+
+
+def _as_text(value):
+    """
+    Return numbers the model sent for a text argument as strings, so they
+    pass validation against the string type advertised in the tool schema.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def _check_params(validate: Callable[[dict], dict], **params) -> Optional[str]:
+    """Validate tool arguments against a compiled schema, returning any error."""
+    try:
+        validate({key: value for key, value in params.items() if value is not None})
+    except fastjsonschema.JsonSchemaValueException as e:
+        error_msg = f"Invalid parameters: {e.message}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+    return None
+
+
+def _message_list(
+    message: Optional[str], messages: Optional[List[str]]
+) -> Optional[List[str]]:
+    """Combine the single and batched message arguments, in that order."""
+    texts = ([message] if message is not None else []) + list(messages or [])
+    return texts or None
+
+
+def _chunk_messages(messages: List[str], limit: int) -> List[str]:
+    """
+    Join messages with newlines into as few chunks of at most ``limit``
+    characters as possible. A message longer than ``limit`` is split.
+    """
+    chunks: List[str] = []
+    current: Optional[str] = None
+    for message in messages:
+        if current is not None and len(current) + 1 + len(message) <= limit:
+            current = f"{current}\n{message}"
+            continue
+        if current is not None:
+            chunks.append(current)
+        while len(message) > limit:
+            chunks.append(message[:limit])
+            message = message[limit:]
+        current = message
+    if current is not None:
+        chunks.append(current)
+    return chunks
 
 
 class DiscordWebhookTool(BaseTool):
@@ -21,6 +455,11 @@ class DiscordWebhookTool(BaseTool):
                 "type": "string",
                 "description": "Message content to send",
             },
+            "messages": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Several messages to send together in as few requests as possible (optional, instead of or after message)",
+            },
             "username": {
                 "type": "string",
                 "description": "Custom username for the message (optional)",
@@ -31,55 +470,78 @@ class DiscordWebhookTool(BaseTool):
                 "description": "Avatar URL for the message (optional)",
             },
         },
-        "required": ["webhook_url", "message"],
+        "required": ["webhook_url"],
     }
 
+    _validate = staticmethod(fastjsonschema.compile(parameters))
+
+    @webhook_errors("Discord")
     async def execute(
         self,
         webhook_url: str,
-        message: str,
+        message: Optional[str] = None,
         username: str = "OpenManus Bot",
         avatar_url: Optional[str] = None,
+        messages: Optional[List[str]] = None,
     ) -> str:
         """
         Send a message to Discord using webhook.
 
+        Batched ``messages`` are joined with newlines and sent in as few
+        requests as Discord's 2000-character content limit allows.
+
         Args:
             webhook_url: Discord webhook URL
             message: Message content to send
             username: Custom username for the message
             avatar_url: Avatar URL for the message
+            messages: Further messages to send in the same batch
 
         Returns:
             Success or error message
         """
-        try:
+        message = _as_text(message)
+        error = _check_params(
+            self._validate,
+            webhook_url=webhook_url,
+            message=message,
+            messages=messages,
+            username=username,
+            avatar_url=avatar_url,
+        )
+        if error:
+            return error
+        texts = _message_list(message, messages)
+        if texts is None:
+            return "Error: Invalid parameters: message or messages is required"
+
+        payloads = []
+        for content in _chunk_messages(texts, _DISCORD_MAX_CONTENT):
             payload = {
-                "content": message,
+                "content": content,
                 "username": username,
             }
 
             if avatar_url:
                 payload["avatar_url"] = avatar_url
-
-            response = requests.post(webhook_url, json=payload, timeout=10)
-
-            if response.status_code == 204:
-                logger.info(f"Discord message sent successfully")
-                return f"Discord message sent successfully!"
-            else:
-                error_msg = f"Failed to send Discord message. Status: {response.status_code}"
+            payloads.append(payload)
+
+        for sent, payload in enumerate(payloads):
+            response = await _post_or_queue(
+                webhook_url, payload, then=payloads[sent + 1 :]
+            )
+
+            if response.status_code != 204:
+                error_msg = (
+                    f"Failed to send Discord message. Status: {response.status_code}"
+                )
+                if sent:
+                    error_msg += f" ({sent} of {len(payloads)} requests sent)"
                 logger.error(error_msg)
                 return f"Error: {error_msg}"
 
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Error sending Discord message: {e}"
-            logger.error(error_msg)
-            return f"Error: {error_msg}"
-        except Exception as e:
-            error_msg = f"Unexpected error: {e}"
-            logger.error(error_msg)
-            return f"Error: {error_msg}"
+        logger.info("Discord message sent successfully")
+        return "Discord message sent successfully!"
 
 
 class SlackWebhookTool(BaseTool):
@@ -98,9 +560,14 @@ class SlackWebhookTool(BaseTool):
                 "type": "string",
                 "description": "Message content to send",
             },
+            "messages": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Several messages to send together in as few requests as possible (optional, instead of or after message)",
+            },
             "channel": {
                 "type": "string",
-                "description": "Channel name (optional, without #)",
+                "description": "Channel name (optional, with or without #)",
             },
             "username": {
                 "type": "string",
@@ -108,55 +575,98 @@ class SlackWebhookTool(BaseTool):
                 "default": "OpenManus Bot",
             },
         },
-        "required": ["webhook_url", "message"],
+        "required": ["webhook_url"],
     }
 
+    _validate = staticmethod(fastjsonschema.compile(parameters))
+
+    @webhook_errors("Slack")
     async def execute(
         self,
         webhook_url: str,
-        message: str,
+        message: Optional[str] = None,
         channel: Optional[str] = None,
         username: str = "OpenManus Bot",
+        messages: Optional[List[str]] = None,
     ) -> str:
         """
         Send a message to Slack using webhook.
 
+        Batched ``messages`` become one section block each, with up to 50
+        blocks per request.
+
         Args:
             webhook_url: Slack webhook URL
             message: Message content to send
             channel: Channel name (optional)
             username: Custom username for the message
+            messages: Further messages to send in the same batch
 
         Returns:
             Success or error message
         """
-        try:
+        message = _as_text(message)
+        error = _check_params(
+            self._validate,
+            webhook_url=webhook_url,
+            message=message,
+            messages=messages,
+            channel=channel,
+            username=username,
+        )
+        if error:
+            return error
+        texts = _message_list(message, messages)
+        if texts is None:
+            return "Error: Invalid parameters: message or messages is required"
+
+        if messages is None:
+            batches = [texts]
+        else:
+            sections = [
+                part
+                for text in texts
+                for part in _chunk_messages([text], _SLACK_MAX_SECTION)
+            ]
+            batches = [
+                sections[start : start + _SLACK_MAX_BLOCKS]
+                for start in range(0, len(sections), _SLACK_MAX_BLOCKS)
+            ]
+
+        if channel and not channel.startswith("#"):
+            channel = "#" + channel
+
+        payloads = []
+        for batch in batches:
             payload = {
-                "text": message,
+                "text": "\n".join(batch),
                 "username": username,
             }
 
+            if messages is not None:
+                payload["blocks"] = [
+                    {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+                    for text in batch
+                ]
+
             if channel:
-                payload["channel"] = f"#{channel}"
+                payload["channel"] = channel
+            payloads.append(payload)
 
-            response = requests.post(webhook_url, json=payload, timeout=10)
+        for sent, payload in enumerate(payloads):
+            response = await _post_or_queue(
+                webhook_url, payload, then=payloads[sent + 1 :]
+            )
 
-            if response.status_code == 200 and response.text == "ok":
-                logger.info(f"Slack message sent successfully")
-                return f"Slack message sent successfully!"
-            else:
+            if response.status_code != 200 or response.content != b"ok":
                 error_msg = f"Failed to send Slack message. Status: {response.status_code}, Response: {response.text}"
+                if sent:
+                    error_msg += f" ({sent} of {len(payloads)} requests sent)"
                 logger.error(error_msg)
                 return f"Error: {error_msg}"
 
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Error sending Slack message: {e}"
-            logger.error(error_msg)
-            return f"Error: {error_msg}"
-        except Exception as e:
-            error_msg = f"Unexpected error: {e}"
-            logger.error(error_msg)
-            return f"Error: {error_msg}"
+        logger.info("Slack message sent successfully")
+        return "Slack message sent successfully!"
 
 
 class TelegramBotTool(BaseTool):
@@ -183,10 +693,13 @@ class TelegramBotTool(BaseTool):
         "required": ["bot_token", "chat_id", "message"],
     }
 
+    _validate = staticmethod(fastjsonschema.compile(parameters))
+
+    @webhook_errors("Telegram")
     async def execute(
         self,
         bot_token: str,
-        chat_id: str,
+        chat_id: Union[str, int],
         message: str,
     ) -> str:
         """
@@ -200,35 +713,43 @@ class TelegramBotTool(BaseTool):
         Returns:
             Success or error message
         """
+        chat_id, message = _as_text(chat_id), _as_text(message)
+        error = _check_params(
+            self._validate, bot_token=bot_token, chat_id=chat_id, message=message
+        )
+        if error:
+            return error
+
+        url = _tg_url(bot_token)
+        payload = {
+            "chat_id": chat_id,
+            "text": message,
+            "parse_mode": "HTML",
+        }
+
+        response = await _post_or_queue(url, payload)
         try:
-            url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-            payload = {
-                "chat_id": chat_id,
-                "text": message,
-                "parse_mode": "HTML",
-            }
-
-            response = requests.post(url, json=payload, timeout=10)
-            result = response.json()
-
-            if result.get("ok"):
-                logger.info(f"Telegram message sent successfully")
-                return f"Telegram message sent successfully!"
-            else:
-                error_msg = f"Failed to send Telegram message: {result.get('description', 'Unknown error')}"
-                logger.error(error_msg)
-                return f"Error: {error_msg}"
-
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Error sending Telegram message: {e}"
+            result = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            result = None
+        if not isinstance(result, dict):
+            error_msg = f"Failed to send Telegram message. Status: {response.status_code}, unexpected non-JSON response"
             logger.error(error_msg)
             return f"Error: {error_msg}"
-        except Exception as e:
-            error_msg = f"Unexpected error: {e}"
+
+        if result.get("ok"):
+            logger.info("Telegram message sent successfully")
+            return "Telegram message sent successfully!"
+        else:
+            error_msg = f"Failed to send Telegram message: {result.get('description', 'Unknown error')}"
             logger.error(error_msg)
             return f"Error: {error_msg}"
 
 
+_BAR = "=" * 50
+_BANNER_TMPL = f"\n{_BAR}\n\U0001F4E7 {{title}}\n{_BAR}\n{{message}}\n{_BAR}\n\n"
+
+
 class ConsoleMessageTool(BaseTool):
     """Tool for displaying messages in console (for testing)."""
 
@@ -250,6 +771,8 @@ class ConsoleMessageTool(BaseTool):
         "required": ["message"],
     }
 
+    _validate = staticmethod(fastjsonschema.compile(parameters))
+
     async def execute(
         self,
         message: str,
@@ -265,16 +788,151 @@ class ConsoleMessageTool(BaseTool):
         Returns:
             Success message
         """
-        print(f"\n{'='*50}")
-        print(f"📧 {title}")
-        print(f"{'='*50}")
-        print(f"{message}")
-        print(f"{'='*50}\n")
+        message, title = _as_text(message), _as_text(title)
+        error = _check_params(self._validate, message=message, title=title)
+        if error:
+            return error
+
+        # Write the whole banner at once so concurrent calls don't interleave.
+        sys.stdout.write(_BANNER_TMPL.format(title=title, message=message))
+        sys.stdout.flush()
 
         logger.info(f"Console message displayed: {title}")
         return f"Message displayed in console: {title}"
 
 
+# Append-mode file descriptors, opened with O_APPEND so each write lands
+# atomically at the end of the file. Filenames come from the agent, so only
+# the most recently used _MAX_OPEN_FDS descriptors are kept open. Each entry
+# also records when the fd was last checked against its path; the check runs
+# at most every _FD_RECHECK_INTERVAL seconds, so a file that was deleted or
+# rotated is reopened without a stat on every write.
+_MAX_OPEN_FDS = 32
+_FD_RECHECK_INTERVAL = 1.0
+_FDS: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+_FDS_LOCK = threading.Lock()
+
+
+def _is_current(fd: int, filename: str) -> bool:
+    """Whether ``fd`` still refers to the file at ``filename``."""
+    try:
+        path_stat = os.stat(filename)
+    except FileNotFoundError:
+        return False
+    fd_stat = os.fstat(fd)
+    return (fd_stat.st_dev, fd_stat.st_ino) == (path_stat.st_dev, path_stat.st_ino)
+
+
+def _drop_fd(filename: str) -> None:
+    """Close and forget the cached fd for ``filename``. Caller holds _FDS_LOCK."""
+    fd, _ = _FDS.pop(filename)
+    try:
+        os.close(fd)
+    except OSError:
+        pass
+
+
+def _append_fd(filename: str, private: bool = False) -> int:
+    """
+    Return a cached append fd for ``filename``. Caller holds _FDS_LOCK.
+
+    A ``private`` file is created, or restricted if it already exists, with
+    owner-only permissions.
+    """
+    entry = _FDS.get(filename)
+    if entry is not None:
+        fd, checked = entry
+        now = time.monotonic()
+        if now - checked < _FD_RECHECK_INTERVAL:
+            _FDS.move_to_end(filename)
+            return fd
+        if _is_current(fd, filename):
+            _FDS[filename] = (fd, now)
+            _FDS.move_to_end(filename)
+            return fd
+        # Deleted or rotated since it was opened; appends would be lost.
+        _drop_fd(filename)
+
+    mode = 0o600 if private else 0o644
+    fd = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, mode)
+    if private:
+        os.fchmod(fd, mode)
+    _FDS[filename] = (fd, time.monotonic())
+    if len(_FDS) > _MAX_OPEN_FDS:
+        _drop_fd(next(iter(_FDS)))
+    return fd
+
+
+def _append_bytes(filename: str, data: bytes, private: bool = False) -> None:
+    view = memoryview(data)
+    # Hold the lock while writing so the fd can't be evicted and closed.
+    with _FDS_LOCK:
+        fd = _append_fd(filename, private)
+        try:
+            while view:
+                view = view[os.write(fd, view) :]
+        except OSError:
+            # Reopen on the next write rather than reuse a failing fd.
+            _drop_fd(filename)
+            raise
+
+
+def _append_lines(filename: str, lines: List[str]) -> None:
+    _append_bytes(filename, "".join(lines).encode("utf-8"))
+
+
+@atexit.register
+def _close_fds() -> None:
+    with _FDS_LOCK:
+        while _FDS:
+            _drop_fd(next(iter(_FDS)))
+
+
+async def _append_message(filename: str, line: str) -> None:
+    """
+    Append ``line`` to ``filename``, returning once it has been written.
+
+    Appends to a file that arrive while an earlier batch for it is waiting on
+    the write lock join that batch, so bursts of appends share one write.
+    """
+    resources = _resources()
+    batch = resources.pending_appends.get(filename)
+    if batch is not None:
+        batch[0].append(line)
+        await asyncio.shield(batch[1])
+        return
+
+    lines = [line]
+    done = asyncio.get_running_loop().create_future()
+    resources.pending_appends[filename] = (lines, done)
+    try:
+        async with resources.write_lock(filename):
+            # Later appends start a new batch once this one is being written.
+            del resources.pending_appends[filename]
+            await asyncio.to_thread(_append_lines, filename, lines)
+    except BaseException as e:
+        if resources.pending_appends.get(filename) == (lines, done):
+            del resources.pending_appends[filename]
+        if not isinstance(e, Exception):
+            e = RuntimeError("Append was cancelled")
+        done.set_exception(e)
+        done.exception()  # Joined appends report it; don't warn if there are none.
+        raise
+    done.set_result(None)
+
+
+async def flush_all() -> None:
+    """Wait for appends still being written. Call before shutdown."""
+    resources = _LOOP_RESOURCES.get(asyncio.get_running_loop())
+    if resources is None:
+        return
+    pending = [done for _, done in resources.pending_appends.values()]
+    await asyncio.gather(*pending, return_exceptions=True)
+    for lock in list(resources.write_locks.values()):
+        async with lock:
+            pass
+
+
 class FileMessageTool(BaseTool):
     """Tool for saving messages to a file."""
 
@@ -301,6 +959,8 @@ class FileMessageTool(BaseTool):
         "required": ["message"],
     }
 
+    _validate = staticmethod(fastjsonschema.compile(parameters))
+
     async def execute(
         self,
         message: str,
@@ -310,6 +970,8 @@ class FileMessageTool(BaseTool):
         """
         Save a message to a file.
 
+        Concurrent appends to the same file are written together in one batch.
+
         Args:
             message: Message content to save
             filename: Filename to save to
@@ -318,10 +980,19 @@ class FileMessageTool(BaseTool):
         Returns:
             Success or error message
         """
+        message = _as_text(message)
+        error = _check_params(
+            self._validate, message=message, filename=filename, append=append
+        )
+        if error:
+            return error
+
         try:
-            mode = "a" if append else "w"
-            with open(filename, mode, encoding="utf-8") as f:
-                f.write(f"{message}\n")
+            if append:
+                await _append_message(filename, f"{message}\n")
+            else:
+                async with _resources().write_lock(filename):
+                    await asyncio.to_thread(self._sync_write, filename, message)
 
             logger.info(f"Message saved to file: {filename}")
             return f"Message saved to file: {filename}"
@@ -330,3 +1001,8 @@ class FileMessageTool(BaseTool):
             error_msg = f"Error saving message to file: {e}"
             logger.error(error_msg)
             return f"Error: {error_msg}"
+
+    @staticmethod
+    def _sync_write(filename: str, message: str) -> None:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(f"{message}\n")
@@ -3,6 +3,7 @@ import asyncio
 
 from app.agent.manus import Manus
 from app.logger import logger
+from app.tool import message_tools
 
 
 async def main():
@@ -30,6 +31,7 @@ async def main():
     finally:
         # Ensure agent resources are cleaned up before exiting
         await agent.cleanup()
+        await message_tools.close()
 
 
 if __name__ == "__main__":
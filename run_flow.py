@@ -6,6 +6,7 @@ from app.agent.manus import Manus
 from app.config import config
 from app.flow.flow_factory import FlowFactory, FlowType
 from app.logger import logger
+from app.tool import message_tools
 
 
 async def run_flow():
@@ -46,6 +47,9 @@ async def run_flow():
         logger.info("Operation cancelled by user.")
     except Exception as e:
         logger.error(f"Error: {str(e)}")
+    finally:
+        # Give queued webhook retries a chance before the loop goes away
+        await message_tools.close()
 
 
 if __name__ == "__main__":
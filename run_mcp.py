@@ -6,6 +6,7 @@ import sys
 from app.agent.mcp import MCPAgent
 from app.config import config
 from app.logger import logger
+from app.tool import message_tools
 
 
 class MCPRunner:
@@ -63,6 +64,7 @@ class MCPRunner:
     async def cleanup(self) -> None:
         """Clean up agent resources."""
         await self.agent.cleanup()
+        await message_tools.close()
         logger.info("Session ended")
 
 
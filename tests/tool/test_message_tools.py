@@ -0,0 +1,508 @@
+import asyncio
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+from typing import AsyncGenerator, Generator, List
+
+import httpx
+import orjson
+import pytest
+import pytest_asyncio
+
+from app.tool import message_tools
+from app.tool.message_tools import (
+    ConsoleMessageTool,
+    DiscordWebhookTool,
+    FileMessageTool,
+    SlackWebhookTool,
+    TelegramBotTool,
+)
+
+
+WEBHOOK_URL = "https://discord.com/api/webhooks/1/token"
+SLACK_URL = "https://hooks.slack.com/services/T0/B0/token"
+
+
+class FakeWebhook:
+    """Mock transport handler answering with the given statuses in order."""
+
+    def __init__(self, *statuses: int, body: bytes = b""):
+        self.statuses: List[int] = list(statuses)
+        self.body = body
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return httpx.Response(status, content=self.body)
+
+
+async def wait_for(predicate, timeout: float = 2.0) -> None:
+    """Polls until predicate() is true or the timeout expires."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path: Path, monkeypatch) -> Generator[Path, None, None]:
+    """Runs each test in a temporary directory with instant retry backoff."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(message_tools, "_backoff_delay", lambda *args, **kw: 0.0)
+    yield tmp_path
+    # Cached fds are keyed by path, and relative paths differ per test.
+    message_tools._close_fds()
+
+
+@pytest.fixture
+def webhook(monkeypatch) -> FakeWebhook:
+    """Routes the webhook tools' HTTP client to a fake webhook."""
+    fake = FakeWebhook(204)
+    monkeypatch.setattr(
+        message_tools,
+        "_new_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(fake)),
+    )
+    return fake
+
+
+@pytest_asyncio.fixture
+async def discord(webhook: FakeWebhook) -> AsyncGenerator[DiscordWebhookTool, None]:
+    """Creates a Discord tool and releases the module resources afterwards."""
+    try:
+        yield DiscordWebhookTool()
+    finally:
+        await message_tools.close()
+
+
+def dead_letters(workdir: Path) -> List[dict]:
+    path = workdir / message_tools._DEAD_LETTER_FILE
+    if not path.exists():
+        return []
+    return [orjson.loads(line) for line in path.read_bytes().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried_in_background(discord, webhook, workdir):
+    """Tests that a 503 is reported as undelivered and retried later."""
+    webhook.statuses = [503, 204]
+
+    result = await discord.execute(WEBHOOK_URL, "hello")
+
+    assert result.startswith("Error: Discord message not delivered: status 503")
+    assert "queued for a background retry" in result
+    await wait_for(lambda: len(webhook.requests) == 2)
+    await message_tools.close()
+    assert dead_letters(workdir) == []
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_are_dead_lettered(discord, webhook, workdir):
+    """Tests that a message still failing after all retries is dead-lettered."""
+    webhook.statuses = [503]
+
+    await discord.execute(WEBHOOK_URL, "hello")
+
+    await wait_for(lambda: dead_letters(workdir))
+    assert len(webhook.requests) == 1 + message_tools._RETRY_ATTEMPTS
+    (record,) = dead_letters(workdir)
+    assert record["url"] == WEBHOOK_URL
+    assert record["payload"]["content"] == "hello"
+    assert record["error"] == "status 503"
+    mode = os.stat(workdir / message_tools._DEAD_LETTER_FILE).st_mode
+    assert stat.S_IMODE(mode) == 0o600
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_due_retries(discord, webhook, workdir, monkeypatch):
+    """Tests that close() lets a retry due within the grace period finish."""
+    monkeypatch.setattr(message_tools, "_backoff_delay", lambda *args, **kw: 0.2)
+    webhook.statuses = [503, 204]
+
+    await discord.execute(WEBHOOK_URL, "hello")
+    await message_tools.close(grace=2.0)
+
+    assert len(webhook.requests) == 2
+    assert dead_letters(workdir) == []
+
+
+@pytest.mark.asyncio
+async def test_pending_retries_are_dead_lettered_on_close(
+    discord, webhook, workdir, monkeypatch
+):
+    """Tests that close() keeps messages whose retry has not run yet."""
+    monkeypatch.setattr(message_tools, "_backoff_delay", lambda *args, **kw: 60.0)
+    webhook.statuses = [503]
+
+    await discord.execute(WEBHOOK_URL, "hello")
+    await message_tools.close(grace=0.1)
+
+    assert len(webhook.requests) == 1
+    (record,) = dead_letters(workdir)
+    assert record["error"] == "shut down before the retry completed"
+
+
+@pytest.mark.asyncio
+async def test_unrecoverable_status_fails_fast(discord, webhook, workdir):
+    """Tests that a 404 is returned at once without queueing a retry."""
+    webhook.statuses = [404]
+
+    result = await discord.execute(WEBHOOK_URL, "hello")
+
+    assert result == "Error: Failed to send Discord message. Status: 404"
+    await asyncio.sleep(0.05)
+    assert len(webhook.requests) == 1
+    await message_tools.close()
+    assert dead_letters(workdir) == []
+
+
+@pytest.mark.asyncio
+async def test_retry_ending_unrecoverable_is_dead_lettered(discord, webhook, workdir):
+    """Tests that a queued message rejected by a dead webhook is kept for replay."""
+    webhook.statuses = [503, 404]
+
+    await discord.execute(WEBHOOK_URL, "hello")
+
+    await wait_for(lambda: dead_letters(workdir))
+    assert len(webhook.requests) == 2
+    (record,) = dead_letters(workdir)
+    assert record["payload"]["content"] == "hello"
+    assert record["error"] == "status 404 (unrecoverable)"
+
+
+def sent_payloads(webhook: FakeWebhook) -> List[dict]:
+    return [orjson.loads(request.content) for request in webhook.requests]
+
+
+@pytest.mark.asyncio
+async def test_discord_batches_messages_into_few_requests(discord, webhook):
+    """Tests that batched Discord messages share requests up to 2000 chars."""
+    messages = [f"{i:03d}" + "x" * 96 for i in range(30)]
+
+    result = await discord.execute(WEBHOOK_URL, messages=messages)
+
+    assert result == "Discord message sent successfully!"
+    contents = [payload["content"] for payload in sent_payloads(webhook)]
+    assert len(contents) == 2
+    assert all(len(content) <= 2000 for content in contents)
+    assert "\n".join(contents).split("\n") == messages
+
+
+@pytest.mark.asyncio
+async def test_discord_requires_a_message(discord, webhook):
+    """Tests that a send without message or messages is rejected."""
+    result = await discord.execute(WEBHOOK_URL)
+
+    assert result.startswith("Error: Invalid parameters:")
+    assert webhook.requests == []
+
+
+@pytest.mark.asyncio
+async def test_slack_batches_messages_as_blocks(webhook):
+    """Tests that batched Slack messages become section blocks."""
+    webhook.statuses, webhook.body = [200], b"ok"
+    tool = SlackWebhookTool()
+    try:
+        result = await tool.execute(
+            SLACK_URL, "first", channel="general", messages=["second", "third"]
+        )
+    finally:
+        await message_tools.close()
+
+    assert result == "Slack message sent successfully!"
+    (payload,) = sent_payloads(webhook)
+    assert payload["channel"] == "#general"
+    assert [block["text"]["text"] for block in payload["blocks"]] == [
+        "first",
+        "second",
+        "third",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_parts_after_a_failure_are_queued_in_order(
+    discord, webhook, workdir
+):
+    """Tests that parts following a queued part are retried after it."""
+    webhook.statuses = [503, 204]
+    messages = ["a" * 2000, "b" * 2000, "c" * 2000]
+
+    result = await discord.execute(WEBHOOK_URL, messages=messages)
+
+    assert "it and the 2 parts after it were queued" in result
+    await wait_for(lambda: len(webhook.requests) == 4)
+    contents = [payload["content"] for payload in sent_payloads(webhook)]
+    assert contents == [messages[0], *messages]
+    await message_tools.close()
+    assert dead_letters(workdir) == []
+
+
+@pytest.mark.asyncio
+async def test_telegram_numeric_chat_id_and_non_json_body(webhook):
+    """Tests Telegram integer chat IDs and non-JSON responses."""
+    tool = TelegramBotTool()
+    try:
+        webhook.body = b'{"ok": true}'
+        webhook.statuses = [200]
+        assert await tool.execute("token", -1001234567890, "hi") == (
+            "Telegram message sent successfully!"
+        )
+        assert orjson.loads(webhook.requests[0].content)["chat_id"] == "-1001234567890"
+
+        webhook.body = b"<html>proxy error</html>"
+        result = await tool.execute("token", "@channel", "hi")
+        assert result.startswith("Error: Failed to send Telegram message. Status: 200")
+    finally:
+        await message_tools.close()
+
+
+@pytest.mark.parametrize(
+    "tool",
+    [
+        DiscordWebhookTool(),
+        SlackWebhookTool(),
+        TelegramBotTool(),
+        ConsoleMessageTool(),
+        FileMessageTool(),
+    ],
+)
+def test_schemas_use_single_types(tool):
+    """Tests that advertised parameters don't use union types."""
+    for prop in tool.parameters["properties"].values():
+        assert isinstance(prop["type"], str)
+
+
+@pytest.mark.asyncio
+async def test_invalid_parameters_are_rejected(webhook, workdir):
+    """Tests that arguments of the wrong type are rejected before sending."""
+    try:
+        result = await TelegramBotTool().execute("token", ["@channel"], "hi")
+    finally:
+        await message_tools.close()
+    assert result.startswith("Error: Invalid parameters:")
+    assert webhook.requests == []
+
+    result = await FileMessageTool().execute("hello", append="yes")
+    assert result.startswith("Error: Invalid parameters:")
+    assert not (workdir / "openmanus_message.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_numeric_text_is_accepted(workdir):
+    """Tests that numbers sent for text arguments are written as text."""
+    filename = str(workdir / "numbers.txt")
+
+    result = await FileMessageTool().execute(42, filename=filename)
+
+    assert result == f"Message saved to file: {filename}"
+    assert Path(filename).read_text() == "42\n"
+
+
+def test_tools_work_across_event_loops(webhook):
+    """Tests that concurrent sends work in more than one event loop."""
+
+    async def send_many() -> List[str]:
+        tool = DiscordWebhookTool()
+        try:
+            return await asyncio.gather(
+                *(tool.execute(WEBHOOK_URL, f"m{i}") for i in range(10))
+            )
+        finally:
+            await message_tools.close()
+
+    for _ in range(2):
+        results = asyncio.run(send_many())
+        assert set(results) == {"Discord message sent successfully!"}
+
+
+@pytest.mark.asyncio
+async def test_append_is_written_before_success(workdir):
+    """Tests that an appended message is on disk when the tool returns."""
+    filename = str(workdir / "messages.txt")
+
+    result = await FileMessageTool().execute("hello", filename=filename, append=True)
+
+    assert result == f"Message saved to file: {filename}"
+    assert Path(filename).read_text() == "hello\n"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_share_writes(workdir, monkeypatch):
+    """Tests that concurrent appends are batched without losing lines."""
+    filename = str(workdir / "messages.txt")
+    writes = []
+    append_lines = message_tools._append_lines
+
+    def counting_append(name: str, lines: List[str]) -> None:
+        writes.append(len(lines))
+        append_lines(name, lines)
+
+    monkeypatch.setattr(message_tools, "_append_lines", counting_append)
+    tool = FileMessageTool()
+
+    await asyncio.gather(
+        *(tool.execute(f"m{i}", filename=filename, append=True) for i in range(50))
+    )
+    await message_tools.flush_all()
+
+    lines = Path(filename).read_text().splitlines()
+    assert sorted(lines) == sorted(f"m{i}" for i in range(50))
+    assert sum(writes) == 50
+    assert len(writes) < 50
+
+
+@pytest.mark.asyncio
+async def test_writes_to_different_files_run_concurrently(workdir, monkeypatch):
+    """Tests that a slow write to one file doesn't hold up other files."""
+    append_lines = message_tools._append_lines
+
+    def slow_append(name: str, lines: List[str]) -> None:
+        time.sleep(0.2)
+        append_lines(name, lines)
+
+    monkeypatch.setattr(message_tools, "_append_lines", slow_append)
+    tool = FileMessageTool()
+
+    start = time.monotonic()
+    await asyncio.gather(
+        *(
+            tool.execute("hello", filename=str(workdir / f"{i}.txt"), append=True)
+            for i in range(5)
+        )
+    )
+
+    assert time.monotonic() - start < 0.6
+    for i in range(5):
+        assert (workdir / f"{i}.txt").read_text() == "hello\n"
+
+
+@pytest.mark.asyncio
+async def test_cached_append_fd_is_not_checked_on_every_write(workdir, monkeypatch):
+    """Tests that repeated appends don't stat the file each time."""
+    filename = str(workdir / "messages.txt")
+    stats = []
+    stat_path = os.stat
+    monkeypatch.setattr(
+        message_tools.os,
+        "stat",
+        lambda *a, **kw: stats.append(a) or stat_path(*a, **kw),
+    )
+    tool = FileMessageTool()
+
+    for i in range(10):
+        await tool.execute(f"m{i}", filename=filename, append=True)
+
+    assert [a for a in stats if a[0] == filename] == []
+    assert len(Path(filename).read_text().splitlines()) == 10
+
+
+@pytest.mark.asyncio
+async def test_rotated_file_is_reopened(workdir, monkeypatch):
+    """Tests that appends follow a file that was rotated away."""
+    monkeypatch.setattr(message_tools, "_FD_RECHECK_INTERVAL", 0.0)
+    filename = workdir / "messages.txt"
+    tool = FileMessageTool()
+
+    await tool.execute("before", filename=str(filename), append=True)
+    filename.rename(workdir / "messages.txt.1")
+    await tool.execute("after", filename=str(filename), append=True)
+
+    assert (workdir / "messages.txt.1").read_text() == "before\n"
+    assert filename.read_text() == "after\n"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("channel", ["general", "#general"])
+async def test_slack_channel_gets_one_hash_prefix(webhook, channel):
+    """Tests that Slack channels are sent with exactly one leading '#'."""
+    webhook.statuses, webhook.body = [200], b"ok"
+    try:
+        result = await SlackWebhookTool().execute(SLACK_URL, "hi", channel=channel)
+    finally:
+        await message_tools.close()
+
+    assert result == "Slack message sent successfully!"
+    (payload,) = sent_payloads(webhook)
+    assert payload == {"text": "hi", "username": "OpenManus Bot", "channel": "#general"}
+
+
+class StdoutRecorder:
+    """Stand-in for sys.stdout that records each write call."""
+
+    def __init__(self):
+        self.writes: List[str] = []
+
+    def write(self, text: str) -> int:
+        self.writes.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_console_banner_is_written_at_once(monkeypatch):
+    """Tests that each console message is printed with a single write."""
+    stdout = StdoutRecorder()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    tool = ConsoleMessageTool()
+
+    await asyncio.gather(*(tool.execute(f"body {i}", title=f"t{i}") for i in range(5)))
+
+    assert len(stdout.writes) == 5
+    for i in range(5):
+        (banner,) = [w for w in stdout.writes if f"t{i}\n" in w]
+        assert f"\nbody {i}\n" in banner
+        assert banner.count("=" * 50) == 3
+
+
+@pytest.mark.asyncio
+async def test_console_banner_title_uses_envelope_emoji(monkeypatch):
+    """Tests that the banner title is prefixed with a correctly encoded emoji."""
+    stdout = StdoutRecorder()
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    await ConsoleMessageTool().execute("body", title="Report")
+
+    (banner,) = stdout.writes
+    assert "\n\U0001F4E7 Report\n" in banner
+    assert "ðŸ" not in banner
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_are_capped_per_host(monkeypatch):
+    """Tests that in-flight requests to one host stay under its limit."""
+    in_flight = {}
+    peak = {}
+
+    async def slow_webhook(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.05)
+        in_flight[host] -= 1
+        return httpx.Response(204)
+
+    monkeypatch.setattr(
+        message_tools,
+        "_new_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(slow_webhook)),
+    )
+    tool = DiscordWebhookTool()
+    other_url = "https://example.com/webhook"
+    try:
+        results = await asyncio.gather(
+            *(tool.execute(WEBHOOK_URL, f"m{i}") for i in range(12)),
+            *(tool.execute(other_url, f"m{i}") for i in range(3)),
+        )
+    finally:
+        await message_tools.close()
+
+    assert set(results) == {"Discord message sent successfully!"}
+    assert peak == {
+        "discord.com": message_tools._HOST_CONCURRENCY["discord.com"],
+        "example.com": 3,
+    }